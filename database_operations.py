@@ -3,29 +3,213 @@ Database Operations - Farmer CRM database connection
 Connects to existing Windows PostgreSQL with real farmer data
 """
 import asyncio
+import json
 import logging
-from typing import Dict, Any, Optional, List, Tuple
-from datetime import datetime, date
-from decimal import Decimal
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 import asyncpg
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.exc import SQLAlchemyError
+from cachetools import TTLCache
 import os
 import sys
 
-# Add parent directory to path for config import
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path for config import, once per process
+_PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PARENT_DIR not in sys.path:
+    sys.path.append(_PARENT_DIR)
 from config import DATABASE_URL, DB_POOL_SETTINGS
 
 logger = logging.getLogger(__name__)
 
+# Read-through cache settings for farmer/crop lookups
+CACHE_TTL_SECONDS = 60
+CACHE_MAX_SIZE = 10_000
+CACHE_LOCK_SHARDS = 64
+
+# Connection pool tuning, overridable from the environment (see README)
+DB_MIN_POOL = int(os.getenv("DB_MIN_POOL", DB_POOL_SETTINGS.get("pool_size", 5)))
+DB_MAX_POOL = int(os.getenv("DB_MAX_POOL", 20))
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", 10))
+DB_MAX_INACTIVE_LIFETIME = float(os.getenv("DB_MAX_INACTIVE_LIFETIME", 300))
+# pgBouncer in transaction mode can't keep asyncpg's cached prepared statements
+PGBOUNCER = os.getenv("PGBOUNCER", "").lower() in ("1", "true", "yes")
+
+# asyncpg's per-connection statement cache prepares each of these once and reuses it
+SQL_GET_FARMER = """
+    SELECT id, farm_name, manager_name, manager_last_name,
+           0 AS total_hectares,  -- Default since column doesn't exist
+           'Farm' AS farmer_type,  -- Default since column doesn't exist
+           city, wa_phone_number
+    FROM farmers
+    WHERE id = $1
+"""
+
+# Display name for farmers aliased as f: trimmed first/last name, blank parts skipped,
+# 'Unknown' when both are missing or blank
+_FARMER_NAME_SQL = (
+    "COALESCE(NULLIF(concat_ws(' ', NULLIF(btrim(f.manager_name), ''), "
+    "NULLIF(btrim(f.manager_last_name), '')), ''), 'Unknown')"
+)
+
+# Defaults and type conversions are done in SQL so rows map straight to dicts
+SQL_GET_ALL_FARMERS = f"""
+    SELECT id,
+           {_FARMER_NAME_SQL} AS name,
+           COALESCE(NULLIF(farm_name, ''), 'Unknown Farm') AS farm_name,
+           COALESCE(NULLIF(phone, ''), NULLIF(wa_phone_number, ''), '') AS phone,
+           COALESCE(city, '') AS location,
+           'Farm' AS farm_type,  -- Default since column doesn't exist
+           0.0::float8 AS total_size_ha  -- Default since column doesn't exist
+    FROM farmers f
+    ORDER BY f.farm_name
+    LIMIT $1
+"""
+
+SQL_GET_FARMER_FIELDS = """
+    SELECT f.field_id, f.field_name,
+           f.field_size::float8 AS field_size,
+           f.field_location, f.soil_type,
+           fc.crop_name AS current_crop, fc.variety,
+           to_char(fc.planting_date, 'YYYY-MM-DD') AS planting_date,
+           fc.status AS crop_status
+    FROM fields f
+    -- Only the most recently planted active crop, so each field is one row
+    LEFT JOIN LATERAL (
+        SELECT crop_name, variety, planting_date, status
+        FROM field_crops
+        WHERE field_id = f.field_id AND status = 'active'
+        ORDER BY planting_date DESC NULLS LAST
+        LIMIT 1
+    ) fc ON true
+    WHERE f.farmer_id = $1
+    ORDER BY f.field_name
+"""
+
+# One row per exchange: each user message paired with the assistant reply that follows it.
+# Takes the last $2 user messages first, then each picks up the message after it; both
+# are index seeks that stop early (ix_msgs_farmer_ts_id, migrations/004).
+SQL_GET_RECENT_CONVERSATIONS = """
+    SELECT u.id, u.message_text AS user_input,
+           CASE WHEN n.role = 'assistant' THEN COALESCE(n.message_text, '') ELSE '' END AS ava_response,
+           u.timestamp,
+           'chat' AS message_type,
+           0.8::float8 AS confidence_score,
+           false AS approved_status
+    FROM (
+        SELECT id, message_text, timestamp
+        FROM incoming_messages
+        WHERE farmer_id = $1 AND role = 'user'
+        ORDER BY timestamp DESC, id DESC
+        LIMIT $2
+    ) u
+    LEFT JOIN LATERAL (
+        SELECT role, message_text
+        FROM incoming_messages
+        WHERE farmer_id = $1 AND (timestamp, id) > (u.timestamp, u.id)
+        ORDER BY timestamp, id
+        LIMIT 1
+    ) n ON true
+    ORDER BY u.timestamp DESC, u.id DESC
+"""
+
+# Farmer, fields and recent exchanges as JSON in one round-trip; the subqueries share
+# $1 = farmer_id and $2 = conversation limit. json (not jsonb) keeps column order.
+SQL_GET_FARMER_CONTEXT = f"""
+    SELECT (SELECT row_to_json(x) FROM ({SQL_GET_FARMER}) x) AS farmer,
+           (SELECT COALESCE(json_agg(x ORDER BY x.field_name), '[]')
+            FROM ({SQL_GET_FARMER_FIELDS}) x) AS fields,
+           (SELECT COALESCE(json_agg(x ORDER BY x.timestamp DESC, x.id DESC), '[]')
+            FROM ({SQL_GET_RECENT_CONVERSATIONS}) x) AS recent_conversations
+"""
+
+SQL_SAVE_CONVERSATION = """
+    INSERT INTO incoming_messages (farmer_id, phone_number, message_text, role, timestamp)
+    VALUES ($1, $2, $3, 'user', CURRENT_TIMESTAMP),
+           ($1, $2, $4, 'assistant', CURRENT_TIMESTAMP)
+    RETURNING id, role
+"""
+
+# Served by ix_crop_tech_lower (migrations/003)
+SQL_GET_CROP = """
+    SELECT DISTINCT crop_type
+    FROM crop_technology
+    WHERE LOWER(crop_type) = LOWER($1)
+    LIMIT 1
+"""
+
+SQL_GET_CONVERSATIONS_FOR_APPROVAL = f"""
+    WITH latest_messages AS (
+        SELECT DISTINCT ON (farmer_id) 
+               m.id, m.farmer_id, m.message_text, m.timestamp,
+               {_FARMER_NAME_SQL} AS farmer_name,
+               f.phone, f.city, f.farm_name
+        FROM incoming_messages m
+        JOIN farmers f ON m.farmer_id = f.id
+        WHERE m.role = 'user'
+        ORDER BY m.farmer_id, m.timestamp DESC  -- matches ix_msgs_user_farmer_ts
+    )
+    SELECT id, farmer_id, farmer_name,
+           COALESCE(phone, '') AS farmer_phone,
+           COALESCE(city, '') AS farmer_location,
+           'Farm' AS farmer_type,
+           '0.0' AS farmer_size,
+           CASE WHEN length(message_text) > 100 THEN left(message_text, 100) || '...'
+                ELSE COALESCE(message_text, '')
+           END AS last_message,
+           timestamp
+    FROM latest_messages
+    ORDER BY timestamp DESC
+    LIMIT 100
+"""
+
+_CONVERSATION_DETAILS_SELECT = f"""
+    SELECT m.id, m.farmer_id, m.message_text, m.timestamp, m.role,
+           {_FARMER_NAME_SQL} AS farmer_name,
+           f.phone, f.city, f.farm_name
+    FROM incoming_messages m
+    JOIN farmers f ON m.farmer_id = f.id
+"""
+
+SQL_GET_CONVERSATION_DETAILS = _CONVERSATION_DETAILS_SELECT + """\
+    WHERE m.id = $1
+"""
+
+SQL_GET_CONVERSATION_DETAILS_BULK = _CONVERSATION_DETAILS_SELECT + """\
+    WHERE m.id = ANY($1::int[])
+"""
+
+SQL_HEALTH_CHECK = "SELECT 1"
+
+# Planner estimate for the farmers table on the search_path; reltuples is -1
+# until the table has been vacuumed or analyzed
+SQL_FARMER_COUNT_ESTIMATE = "SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = 'farmers'::regclass"
+
+
+def _to_field(field: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize field_size as before: int 0 when missing or zero, else float"""
+    field["field_size"] = float(field["field_size"]) if field["field_size"] else 0
+    return field
+
+
+def _row_to_conversation_details(row: asyncpg.Record) -> Dict[str, Any]:
+    """Build conversation details dict from a _CONVERSATION_DETAILS_SELECT row"""
+    return {
+        "id": row["id"],
+        "farmer_id": row["farmer_id"],
+        "farmer_name": row["farmer_name"],
+        "user_input": row["message_text"] if row["role"] == 'user' else "",
+        "ava_response": row["message_text"] if row["role"] == 'assistant' else "",
+        "timestamp": row["timestamp"],
+        "approved_status": False
+    }
+
 class DatabaseOperations:
     """
     Database operations for existing farmer_crm database
     Connects to Windows PostgreSQL with real agricultural data
     """
     
+    __slots__ = ('connection_string', 'pool', '_pool_lock', '_farmer_cache', '_crop_cache', '_cache_locks')
+    
     def __init__(self, connection_string: str = None):
         self.connection_string = connection_string or DATABASE_URL
         # Ensure PostgreSQL only
@@ -36,333 +220,304 @@ class DatabaseOperations:
             # This is correct for WSL2 to Windows connection
             pass
         
-        self.engine = create_engine(
-            self.connection_string,
-            **DB_POOL_SETTINGS
-        )
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        # Pool is created lazily by init() since it needs a running event loop
+        self.pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
+        
+        # Every inbound chat message re-fetches farmer context, so cache lookups
+        self._farmer_cache = TTLCache(maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL_SECONDS)
+        self._crop_cache = TTLCache(maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL_SECONDS)
+        self._cache_locks = [asyncio.Lock() for _ in range(CACHE_LOCK_SHARDS)]
         
-    def get_session(self) -> Session:
-        """Get database session"""
-        return self.SessionLocal()
+    async def init(self) -> asyncpg.Pool:
+        """Create the asyncpg connection pool on first use"""
+        if self.pool is None:
+            async with self._pool_lock:
+                if self.pool is None:
+                    self.pool = await asyncpg.create_pool(
+                        dsn=self.connection_string,
+                        # config pool_size may exceed DB_MAX_POOL; asyncpg rejects min > max
+                        min_size=min(DB_MIN_POOL, DB_MAX_POOL),
+                        max_size=DB_MAX_POOL,
+                        command_timeout=DB_COMMAND_TIMEOUT,
+                        max_inactive_connection_lifetime=DB_MAX_INACTIVE_LIFETIME,
+                        statement_cache_size=0 if PGBOUNCER else 1024
+                    )
+        return self.pool
+    
+    async def close(self) -> None:
+        """Close the connection pool"""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+        
+    @asynccontextmanager
+    async def get_session(self) -> AsyncIterator[asyncpg.Connection]:
+        """Get pooled database connection"""
+        pool = await self.init()
+        async with pool.acquire() as conn:
+            yield conn
+    
+    async def _cached(self, cache: TTLCache, key: Any, loader) -> Optional[Dict[str, Any]]:
+        """Return cache[key], loading it once per key on a miss (None results are not cached)"""
+        value = cache.get(key)
+        if value is None:
+            # Sharded lock so concurrent misses on the same key hit the database once
+            async with self._cache_locks[hash(key) % len(self._cache_locks)]:
+                value = cache.get(key)
+                if value is None:
+                    value = await loader(key)
+                    if value is not None:
+                        cache[key] = value
+        # Hand out a copy so callers can't mutate the cached entry
+        return dict(value) if value is not None else None
+    
+    def invalidate_farmer(self, farmer_id: int) -> None:
+        """Drop cached farmer info, call after writing to the farmers table"""
+        self._farmer_cache.pop(farmer_id, None)
     
     async def get_farmer_info(self, farmer_id: int) -> Optional[Dict[str, Any]]:
-        """Get farmer information by ID"""
+        """Get farmer information by ID (cached for CACHE_TTL_SECONDS)"""
+        return await self._cached(self._farmer_cache, farmer_id, self._load_farmer_info)
+    
+    async def _load_farmer_info(self, farmer_id: int) -> Optional[Dict[str, Any]]:
+        """Load farmer information by ID from the database"""
         try:
-            with self.get_session() as session:
-                result = session.execute(
-                    text("""
-                    SELECT id, farm_name, manager_name, manager_last_name, 
-                           city, wa_phone_number
-                    FROM farmers 
-                    WHERE id = :farmer_id
-                    """),
-                    {"farmer_id": farmer_id}
-                ).fetchone()
+            async with self.get_session() as conn:
+                result = await conn.fetchrow(SQL_GET_FARMER, farmer_id)
                 
                 if result:
-                    return {
-                        "id": result[0],
-                        "farm_name": result[1],
-                        "manager_name": result[2],
-                        "manager_last_name": result[3],
-                        "total_hectares": 0,  # Default since column doesn't exist
-                        "farmer_type": "Farm",  # Default since column doesn't exist
-                        "city": result[4],
-                        "wa_phone_number": result[5]
-                    }
+                    return dict(result)
                 return None
                 
         except Exception as e:
-            logger.error(f"Error getting farmer info: {str(e)}")
+            logger.exception("Error getting farmer info: %s", e)
             return None
     
     async def get_all_farmers(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get list of all farmers for UI selection"""
         try:
-            with self.get_session() as session:
-                results = session.execute(
-                    text("""
-                    SELECT id, farm_name, manager_name, manager_last_name, 
-                           email, phone, city, wa_phone_number
-                    FROM farmers 
-                    ORDER BY farm_name
-                    LIMIT :limit
-                    """),
-                    {"limit": limit}
-                ).fetchall()
-                
-                farmers = []
-                for row in results:
-                    farmers.append({
-                        "id": row[0],
-                        "name": f"{row[2]} {row[3]}".strip() if row[2] and row[3] else "Unknown",
-                        "farm_name": row[1] or "Unknown Farm",
-                        "phone": row[5] or row[7] or "",
-                        "location": row[6] or "",
-                        "farm_type": "Farm",  # Default since column doesn't exist
-                        "total_size_ha": 0.0  # Default since column doesn't exist
-                    })
-                
-                return farmers
+            async with self.get_session() as conn:
+                results = await conn.fetch(SQL_GET_ALL_FARMERS, limit)
+                return [dict(row) for row in results]
                 
         except Exception as e:
-            logger.error(f"Error getting all farmers: {str(e)}")
+            logger.exception("Error getting all farmers: %s", e)
             return []
     
     async def get_farmer_fields(self, farmer_id: int) -> List[Dict[str, Any]]:
         """Get all fields for a farmer"""
         try:
-            with self.get_session() as session:
-                results = session.execute(
-                    text("""
-                    SELECT f.field_id, f.field_name, f.field_size, f.field_location,
-                           f.soil_type, 
-                           fc.crop_name, fc.variety, fc.planting_date, fc.status
-                    FROM fields f
-                    LEFT JOIN field_crops fc ON f.field_id = fc.field_id 
-                        AND fc.status = 'active'
-                    WHERE f.farmer_id = :farmer_id
-                    ORDER BY f.field_name
-                    """),
-                    {"farmer_id": farmer_id}
-                ).fetchall()
-                
-                fields = []
-                for row in results:
-                    fields.append({
-                        "field_id": row[0],
-                        "field_name": row[1],
-                        "field_size": float(row[2]) if row[2] else 0,
-                        "field_location": row[3],
-                        "soil_type": row[4],
-                        "current_crop": row[5],
-                        "variety": row[6],
-                        "planting_date": row[7].isoformat() if row[7] else None,
-                        "crop_status": row[8]
-                    })
-                
-                return fields
+            async with self.get_session() as conn:
+                results = await conn.fetch(SQL_GET_FARMER_FIELDS, farmer_id)
+                return [_to_field(dict(row)) for row in results]
                 
         except Exception as e:
-            logger.error(f"Error getting farmer fields: {str(e)}")
+            logger.exception("Error getting farmer fields: %s", e)
             return []
     
     async def get_recent_conversations(self, farmer_id: int, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent conversations for context from incoming_messages table"""
+        """Get the last `limit` question/answer exchanges for context from incoming_messages table"""
+        try:
+            async with self.get_session() as conn:
+                results = await conn.fetch(SQL_GET_RECENT_CONVERSATIONS, farmer_id, limit)
+                return [dict(row) for row in results]
+                
+        except Exception as e:
+            logger.exception("Error getting conversations: %s", e)
+            return []
+    
+    async def get_farmer_context(self, farmer_id: int, conv_limit: int = 10) -> Optional[Dict[str, Any]]:
+        """
+        Get farmer info, fields and recent conversations in a single query for chat context
+        Values come back JSON-decoded, so timestamps are ISO strings
+        """
         try:
-            with self.get_session() as session:
-                results = session.execute(
-                    text("""
-                    SELECT id, message_text, timestamp, role
-                    FROM incoming_messages
-                    WHERE farmer_id = :farmer_id
-                    ORDER BY timestamp DESC
-                    LIMIT :limit
-                    """),
-                    {"farmer_id": farmer_id, "limit": limit}
-                ).fetchall()
+            async with self.get_session() as conn:
+                result = await conn.fetchrow(SQL_GET_FARMER_CONTEXT, farmer_id, conv_limit)
                 
-                conversations = []
-                for row in results:
-                    conversations.append({
-                        "id": row[0],
-                        "user_input": row[1] if row[3] == 'user' else "",
-                        "ava_response": row[1] if row[3] == 'assistant' else "",
-                        "timestamp": row[2],
-                        "message_type": "chat",
-                        "confidence_score": 0.8,
-                        "approved_status": False
-                    })
+                if result["farmer"] is None:
+                    return None
                 
-                return conversations
+                farmer = json.loads(result["farmer"])
+                # Same shape as get_farmer_info, so warm its cache too
+                self._farmer_cache[farmer_id] = dict(farmer)
+                return {
+                    "farmer": farmer,
+                    "fields": [_to_field(field) for field in json.loads(result["fields"])],
+                    "recent_conversations": json.loads(result["recent_conversations"])
+                }
                 
         except Exception as e:
-            logger.error(f"Error getting conversations: {str(e)}")
-            return []
+            logger.exception("Error getting farmer context: %s", e)
+            return None
     
     async def save_conversation(self, farmer_id: int, conversation_data: Dict[str, Any]) -> Optional[int]:
         """Save a conversation to incoming_messages table"""
         try:
-            with self.get_session() as session:
-                # Save user message
-                result1 = session.execute(
-                    text("""
-                    INSERT INTO incoming_messages (farmer_id, phone_number, message_text, role, timestamp)
-                    VALUES (:farmer_id, :phone_number, :message_text, 'user', CURRENT_TIMESTAMP)
-                    RETURNING id
-                    """),
-                    {
-                        "farmer_id": farmer_id,
-                        "phone_number": conversation_data.get("wa_phone_number", "unknown"),
-                        "message_text": conversation_data.get("question")
-                    }
-                )
-                
-                # Save assistant response
-                result2 = session.execute(
-                    text("""
-                    INSERT INTO incoming_messages (farmer_id, phone_number, message_text, role, timestamp)
-                    VALUES (:farmer_id, :phone_number, :message_text, 'assistant', CURRENT_TIMESTAMP)
-                    RETURNING id
-                    """),
-                    {
-                        "farmer_id": farmer_id,
-                        "phone_number": conversation_data.get("wa_phone_number", "unknown"),
-                        "message_text": conversation_data.get("answer")
-                    }
+            async with self.get_session() as conn:
+                # Save user message and assistant response in one round-trip;
+                # a single statement is atomic, so no explicit transaction is needed
+                rows = await conn.fetch(
+                    SQL_SAVE_CONVERSATION,
+                    farmer_id,
+                    conversation_data.get("wa_phone_number", "unknown"),
+                    conversation_data.get("question"),
+                    conversation_data.get("answer")
                 )
-                session.commit()
-                conv_id = result2.scalar()
+                conv_id = next(row["id"] for row in rows if row["role"] == 'assistant')
                 
-                logger.info(f"Saved conversation pair")
+                logger.info("Saved conversation pair")
                 return conv_id
                 
         except Exception as e:
-            logger.error(f"Error saving conversation: {str(e)}")
+            logger.exception("Error saving conversation: %s", e)
             return None
     
+    async def save_conversations_bulk(self, conversations: List[Tuple[int, Dict[str, Any]]]) -> int:
+        """
+        Save many (farmer_id, conversation_data) pairs to incoming_messages with binary COPY
+        Returns the number of pairs saved; message ids are not returned on this path
+        """
+        if not conversations:
+            return 0
+        try:
+            async with self.get_session() as conn:
+                # One server-side timestamp per batch, so bulk rows order consistently with
+                # save_conversation's CURRENT_TIMESTAMP (naive, to match the timestamp column)
+                now = await conn.fetchval("SELECT LOCALTIMESTAMP")
+                records = []
+                for farmer_id, conversation_data in conversations:
+                    phone_number = conversation_data.get("wa_phone_number", "unknown")
+                    records.append((farmer_id, phone_number, conversation_data.get("question"), 'user', now))
+                    records.append((farmer_id, phone_number, conversation_data.get("answer"), 'assistant', now))
+                
+                await conn.copy_records_to_table(
+                    'incoming_messages',
+                    records=records,
+                    columns=['farmer_id', 'phone_number', 'message_text', 'role', 'timestamp']
+                )
+            
+            logger.info("Saved %s conversation pairs", len(conversations))
+            return len(conversations)
+            
+        except Exception as e:
+            logger.exception("Error saving conversations: %s", e)
+            return 0
+    
     async def get_crop_info(self, crop_name: str) -> Optional[Dict[str, Any]]:
-        """Get crop information from crop_protection_croatia"""
+        """Get crop information from crop_protection_croatia (cached for CACHE_TTL_SECONDS)"""
+        if not isinstance(crop_name, str):
+            logger.warning("Invalid crop name for crop info lookup: %r", crop_name)
+            return None
+        return await self._cached(self._crop_cache, crop_name.lower(), self._load_crop_info)
+    
+    async def _load_crop_info(self, crop_name: str) -> Optional[Dict[str, Any]]:
+        """Load crop information from the database"""
         try:
-            with self.get_session() as session:
+            async with self.get_session() as conn:
                 # First check if we have crop technology info
-                result = session.execute(
-                    text("""
-                    SELECT DISTINCT crop_type
-                    FROM crop_technology
-                    WHERE LOWER(crop_type) = LOWER(:crop_name)
-                    LIMIT 1
-                    """),
-                    {"crop_name": crop_name}
-                ).fetchone()
+                crop_type = await conn.fetchval(SQL_GET_CROP, crop_name)
                 
-                if result:
+                if crop_type:
                     return {
                         "id": 1,
-                        "crop_name": result[0],
-                        "croatian_name": result[0],
+                        "crop_name": crop_type,
+                        "croatian_name": crop_type,
                         "category": "Crop",
                         "planting_season": "Spring",
                         "harvest_season": "Fall",
-                        "description": f"Information about {result[0]}"
+                        "description": f"Information about {crop_type}"
                     }
                 return None
                 
         except Exception as e:
-            logger.error(f"Error getting crop info: {str(e)}")
+            logger.exception("Error getting crop info: %s", e)
             return None
     
     async def get_conversations_for_approval(self) -> Dict[str, List[Dict[str, Any]]]:
         """Get conversations grouped by approval status for agronomic dashboard"""
         try:
-            with self.get_session() as session:
+            async with self.get_session() as conn:
                 # Get latest user messages for each farmer
-                results = session.execute(
-                    text("""
-                    WITH latest_messages AS (
-                        SELECT DISTINCT ON (farmer_id) 
-                               m.id, m.farmer_id, m.message_text, m.timestamp,
-                               f.manager_name, f.manager_last_name, f.phone, 
-                               f.city, f.farm_name
-                        FROM incoming_messages m
-                        JOIN farmers f ON m.farmer_id = f.id
-                        WHERE m.role = 'user'
-                        ORDER BY farmer_id, m.timestamp DESC
-                    )
-                    SELECT * FROM latest_messages
-                    ORDER BY timestamp DESC
-                    LIMIT 100
-                    """)
-                ).fetchall()
+                results = await conn.fetch(SQL_GET_CONVERSATIONS_FOR_APPROVAL)
                 
                 # For now, all conversations are unapproved since the table doesn't have approval status
-                unapproved = []
-                
-                for row in results:
-                    conv = {
-                        "id": row[0],
-                        "farmer_id": row[1],
-                        "farmer_name": f"{row[4]} {row[5]}".strip() if row[4] and row[5] else "Unknown",
-                        "farmer_phone": row[6] or "",
-                        "farmer_location": row[7] or "",
-                        "farmer_type": "Farm",
-                        "farmer_size": "0.0",
-                        "last_message": row[2][:100] + "..." if row[2] and len(row[2]) > 100 else row[2] or "",
-                        "timestamp": row[3]
-                    }
-                    unapproved.append(conv)
+                unapproved = [dict(row) for row in results]
                 
                 return {"unapproved": unapproved, "approved": []}
                 
         except Exception as e:
-            logger.error(f"Error getting conversations for approval: {str(e)}")
+            logger.exception("Error getting conversations for approval: %s", e)
             return {"unapproved": [], "approved": []}
     
     async def get_conversation_details(self, conversation_id: int) -> Optional[Dict[str, Any]]:
         """Get detailed conversation information"""
         try:
-            with self.get_session() as session:
-                result = session.execute(
-                    text("""
-                    SELECT m.id, m.farmer_id, m.message_text, m.timestamp, m.role,
-                           f.manager_name, f.manager_last_name, f.phone, 
-                           f.city, f.farm_name
-                    FROM incoming_messages m
-                    JOIN farmers f ON m.farmer_id = f.id
-                    WHERE m.id = :conversation_id
-                    """),
-                    {"conversation_id": conversation_id}
-                ).fetchone()
+            async with self.get_session() as conn:
+                result = await conn.fetchrow(SQL_GET_CONVERSATION_DETAILS, conversation_id)
                 
                 if result:
-                    return {
-                        "id": result[0],
-                        "farmer_id": result[1],
-                        "farmer_name": f"{result[5]} {result[6]}".strip() if result[5] and result[6] else "Unknown",
-                        "user_input": result[2] if result[4] == 'user' else "",
-                        "ava_response": result[2] if result[4] == 'assistant' else "",
-                        "timestamp": result[3],
-                        "approved_status": False
-                    }
+                    return _row_to_conversation_details(result)
                 return None
                 
         except Exception as e:
-            logger.error(f"Error getting conversation details: {str(e)}")
+            logger.exception("Error getting conversation details: %s", e)
             return None
+    
+    async def get_conversation_details_bulk(self, conversation_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get detailed conversation information for many ids in one query, keyed by id"""
+        if not conversation_ids:
+            return {}
+        try:
+            async with self.get_session() as conn:
+                results = await conn.fetch(SQL_GET_CONVERSATION_DETAILS_BULK, list(conversation_ids))
+                return {row["id"]: _row_to_conversation_details(row) for row in results}
+                
+        except Exception as e:
+            logger.exception("Error getting conversation details: %s", e)
+            return {}
 
-    async def health_check(self) -> bool:
+    async def health_check(self, verbose: bool = False) -> bool:
         """Check database connectivity to farmer_crm database"""
         try:
-            with self.get_session() as session:
-                result = session.execute(text("SELECT COUNT(*) FROM farmers"))
-                count = result.scalar()
-                logger.info(f"Database health check: Connected to farmer_crm with {count} farmers")
+            async with self.get_session() as conn:
+                # Liveness only - avoid a COUNT(*) seq scan on every probe
+                await conn.fetchval(SQL_HEALTH_CHECK)
+                if verbose:
+                    # Planner estimate, O(1) instead of scanning farmers
+                    count = await conn.fetchval(SQL_FARMER_COUNT_ESTIMATE)
+                    logger.info("Database health check: Connected to farmer_crm with ~%s farmers", count)
                 return True
         except Exception as e:
-            logger.error(f"Database health check failed: {str(e)}")
+            logger.exception("Database health check failed: %s", e)
             return False
 
     async def test_windows_postgresql(self) -> bool:
         """Test connection to Windows PostgreSQL"""
         try:
-            with self.get_session() as session:
+            async with self.get_session() as conn:
+                # Count farmers and the other tables in a single round-trip
+                tables = ['fields', 'field_crops', 'incoming_messages', 'crop_protection_croatia']
+                counts = await conn.fetchrow(
+                    "SELECT " + ", ".join(
+                        f"(SELECT COUNT(*) FROM {table}) AS {table}" for table in ['farmers'] + tables
+                    )
+                )
+                
                 # Test farmers table
-                farmer_count = session.execute(text("SELECT COUNT(*) FROM farmers")).scalar()
-                print(f"✅ Connected to farmer_crm! Found {farmer_count} farmers")
+                print(f"✅ Connected to farmer_crm! Found {counts['farmers']} farmers")
                 
                 # Show some sample data
-                farmers = session.execute(text("SELECT farm_name, manager_name, city FROM farmers LIMIT 5")).fetchall()
+                farmers = await conn.fetch("SELECT farm_name, manager_name, city FROM farmers LIMIT 5")
                 print("\n📋 Sample farmers:")
                 for farm in farmers:
                     print(f"  - {farm[0]}: {farm[1]} ({farm[2]})")
                 
                 # Test other tables
-                tables = ['fields', 'field_crops', 'incoming_messages', 'crop_protection_croatia']
                 print("\n📊 Table counts:")
                 for table in tables:
-                    count = session.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
-                    print(f"  - {table}: {count} records")
+                    print(f"  - {table}: {counts[table]} records")
                 
                 return True
         except Exception as e:
@@ -0,0 +1,7 @@
+-- Partial index for get_conversations_for_approval
+-- DISTINCT ON (farmer_id) ... WHERE role = 'user' ORDER BY farmer_id, timestamp DESC
+-- walks user messages already in (farmer_id, timestamp DESC) order, so the plan needs no sort step.
+-- CONCURRENTLY avoids blocking writes to incoming_messages; it cannot run inside a transaction.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_msgs_user_farmer_ts
+    ON incoming_messages (farmer_id, timestamp DESC)
+    WHERE role = 'user';
\ No newline at end of file
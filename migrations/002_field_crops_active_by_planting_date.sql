@@ -0,0 +1,4 @@
+-- Index for get_farmer_fields
+-- The LATERAL lookup of each field's latest active crop becomes a single index probe.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_field_crops_field_status_planting
+    ON field_crops (field_id, status, planting_date DESC NULLS LAST);
\ No newline at end of file
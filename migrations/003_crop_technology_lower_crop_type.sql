@@ -0,0 +1,5 @@
+-- Expression index for get_crop_info
+-- WHERE LOWER(crop_type) = LOWER($1) matches this expression, so the lookup is an index probe
+-- instead of a sequential scan of crop_technology.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_crop_tech_lower
+    ON crop_technology (LOWER(crop_type));
\ No newline at end of file
@@ -0,0 +1,5 @@
+-- Index for get_recent_conversations
+-- Each recent user message looks up the message right after it with
+-- (timestamp, id) > (...) ORDER BY timestamp, id LIMIT 1, which this index answers with one seek.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_msgs_farmer_ts_id
+    ON incoming_messages (farmer_id, timestamp, id);
\ No newline at end of file
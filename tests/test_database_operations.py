@@ -0,0 +1,242 @@
+"""
+Integration tests for DatabaseOperations
+Run against a throwaway PostgreSQL: TEST_DATABASE_URL=postgresql://... python -m pytest
+"""
+import asyncio
+import os
+import sys
+import types
+import uuid
+
+import pytest
+
+asyncpg = pytest.importorskip("asyncpg")
+pytest.importorskip("cachetools")
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if not TEST_DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL not set", allow_module_level=True)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import config  # noqa: F401
+except ImportError:
+    # config lives outside this repo; provide the two settings the module reads
+    sys.modules["config"] = types.SimpleNamespace(
+        DATABASE_URL=TEST_DATABASE_URL, DB_POOL_SETTINGS={"pool_size": 1}
+    )
+
+import database_operations  # noqa: E402
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+SCHEMA_SQL = """
+    CREATE TABLE farmers (
+        id SERIAL PRIMARY KEY,
+        farm_name VARCHAR(100),
+        manager_name VARCHAR(50),
+        manager_last_name VARCHAR(50),
+        email VARCHAR(100),
+        phone VARCHAR(20),
+        city VARCHAR(100),
+        wa_phone_number VARCHAR(20)
+    );
+    CREATE TABLE fields (
+        field_id SERIAL PRIMARY KEY,
+        farmer_id INTEGER REFERENCES farmers(id),
+        field_name VARCHAR(100) NOT NULL,
+        field_size DECIMAL(10, 2),
+        field_location VARCHAR(200),
+        soil_type VARCHAR(50)
+    );
+    CREATE TABLE field_crops (
+        id SERIAL PRIMARY KEY,
+        field_id INTEGER REFERENCES fields(field_id),
+        crop_name VARCHAR(100) NOT NULL,
+        variety VARCHAR(100),
+        planting_date DATE,
+        status VARCHAR(20) DEFAULT 'active'
+    );
+    CREATE TABLE crop_technology (
+        id SERIAL PRIMARY KEY,
+        crop_type VARCHAR(100)
+    );
+    CREATE TABLE incoming_messages (
+        id SERIAL PRIMARY KEY,
+        farmer_id INTEGER REFERENCES farmers(id),
+        phone_number VARCHAR(20),
+        message_text TEXT,
+        role VARCHAR(20),
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    INSERT INTO farmers (farm_name, manager_name, manager_last_name, city, wa_phone_number)
+    VALUES ('OPG Horvat', 'Ivan', 'Horvat', 'Osijek', '+385911111111');
+    INSERT INTO crop_technology (crop_type) VALUES ('Kukuruz');
+    INSERT INTO fields (farmer_id, field_name, field_size) VALUES (1, 'Gornja njiva', 3.00), (1, 'Vrt', NULL);
+"""
+
+
+@pytest.fixture
+def database_url(monkeypatch):
+    """Fresh schema per test, selected through the DSN's search_path server setting"""
+    schema = f"test_ava_{uuid.uuid4().hex[:8]}"
+
+    async def run(*statements):
+        conn = await asyncpg.connect(TEST_DATABASE_URL)
+        try:
+            for sql in statements:
+                await conn.execute(sql)
+        finally:
+            await conn.close()
+
+    # Each migration is sent on its own: CREATE INDEX CONCURRENTLY cannot run in a transaction block
+    migrations = []
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        if name.endswith(".sql"):
+            with open(os.path.join(MIGRATIONS_DIR, name), encoding="utf-8") as f:
+                migrations.append(f.read())
+    asyncio.run(run(f"CREATE SCHEMA {schema}; SET search_path TO {schema}; {SCHEMA_SQL}", *migrations))
+    # One pooled connection, so every call reuses the same checked-in connection
+    monkeypatch.setattr(database_operations, "DB_MIN_POOL", 1)
+    monkeypatch.setattr(database_operations, "DB_MAX_POOL", 1)
+    separator = "&" if "?" in TEST_DATABASE_URL else "?"
+    yield f"{TEST_DATABASE_URL}{separator}search_path={schema}"
+    asyncio.run(run(f"DROP SCHEMA {schema} CASCADE"))
+
+
+def run_with_db(database_url, scenario):
+    async def main():
+        db = database_operations.DatabaseOperations(database_url)
+        try:
+            return await scenario(db)
+        finally:
+            await db.close()
+    return asyncio.run(main())
+
+
+def test_health_check_repeated_on_same_connection(database_url):
+    async def scenario(db):
+        return [await db.health_check() for _ in range(4)] + [await db.health_check(verbose=True)]
+
+    assert run_with_db(database_url, scenario) == [True, True, True, True, True]
+
+
+def test_save_and_read_conversations_repeated_on_same_connection(database_url):
+    async def scenario(db):
+        first = await db.save_conversation(1, {"question": "Kada sijati kukuruz?", "answer": "U travnju."})
+        second = await db.save_conversation(1, {"question": "Koliko gnojiva?", "answer": "Ovisi o tlu."})
+        details = [await db.get_conversation_details(first), await db.get_conversation_details(second)]
+        return first, second, details
+
+    first, second, details = run_with_db(database_url, scenario)
+    assert isinstance(first, int) and isinstance(second, int)
+    assert [d["ava_response"] for d in details] == ["U travnju.", "Ovisi o tlu."]
+    assert details[0]["farmer_name"] == "Ivan Horvat"
+
+
+def test_recent_conversations_pair_each_question_with_its_reply(database_url):
+    async def scenario(db):
+        await db.save_conversation(1, {"question": "Kada sijati kukuruz?", "answer": "U travnju."})
+        await db.save_conversation(1, {"question": "Koliko gnojiva?", "answer": None})
+        return await db.get_recent_conversations(1, limit=10), await db.get_farmer_context(1)
+
+    recent, context = run_with_db(database_url, scenario)
+    assert [(c["user_input"], c["ava_response"]) for c in recent] == [
+        ("Koliko gnojiva?", ""),
+        ("Kada sijati kukuruz?", "U travnju."),
+    ]
+    assert [c["ava_response"] for c in context["recent_conversations"]] == ["", "U travnju."]
+
+
+def test_get_all_farmers_returns_list(database_url):
+    async def scenario(db):
+        return [await db.get_all_farmers() for _ in range(2)]
+
+    first, second = run_with_db(database_url, scenario)
+    assert first == second
+    assert [(f["name"], f["phone"], f["location"]) for f in first] == [("Ivan Horvat", "+385911111111", "Osijek")]
+
+
+def test_save_conversations_bulk_orders_with_single_saves(database_url):
+    async def scenario(db):
+        await db.save_conversation(1, {"question": "Prvo pitanje", "answer": "Prvi odgovor"})
+        saved = await db.save_conversations_bulk([
+            (1, {"question": "Drugo pitanje", "answer": "Drugi odgovor"}),
+            (1, {"question": "Trece pitanje", "answer": "Treci odgovor"}),
+        ])
+        return saved, await db.get_recent_conversations(1, limit=10)
+
+    saved, recent = run_with_db(database_url, scenario)
+    assert saved == 2
+    assert [(c["user_input"], c["ava_response"]) for c in recent] == [
+        ("Trece pitanje", "Treci odgovor"),
+        ("Drugo pitanje", "Drugi odgovor"),
+        ("Prvo pitanje", "Prvi odgovor"),
+    ]
+
+
+def test_field_size_types_match_between_fields_and_context(database_url):
+    async def scenario(db):
+        return await db.get_farmer_fields(1), await db.get_farmer_context(1)
+
+    fields, context = run_with_db(database_url, scenario)
+    sizes = [(f["field_name"], f["field_size"], type(f["field_size"])) for f in fields]
+    assert sizes == [("Gornja njiva", 3.0, float), ("Vrt", 0, int)]
+    assert [(f["field_name"], f["field_size"], type(f["field_size"])) for f in context["fields"]] == sizes
+
+
+def test_get_crop_info_is_case_insensitive_and_rejects_non_strings(database_url):
+    async def scenario(db):
+        return await db.get_crop_info("KUKURUZ"), await db.get_crop_info("kukuruz"), await db.get_crop_info(None)
+
+    upper, lower, missing = run_with_db(database_url, scenario)
+    assert upper["crop_name"] == lower["crop_name"] == "Kukuruz"
+    assert missing is None
+
+
+def test_farmer_name_skips_blank_parts(database_url):
+    async def scenario(db):
+        async with db.get_session() as conn:
+            await conn.execute("""
+                INSERT INTO farmers (farm_name, manager_name, manager_last_name) VALUES
+                ('OPG Kovac', 'Marko', ''), ('OPG Babic', '  ', NULL), ('OPG Novak', ' Ana ', ' Novak ')
+            """)
+        return {f["farm_name"]: f["name"] for f in await db.get_all_farmers()}
+
+    assert run_with_db(database_url, scenario) == {
+        "OPG Babic": "Unknown",
+        "OPG Horvat": "Ivan Horvat",
+        "OPG Kovac": "Marko",
+        "OPG Novak": "Ana Novak",
+    }
+
+
+def test_conversations_for_approval_uses_user_farmer_ts_index(database_url):
+    async def scenario(db):
+        async with db.get_session() as conn:
+            await conn.execute("SET enable_seqscan = off")
+            rows = await conn.fetch("EXPLAIN " + database_operations.SQL_GET_CONVERSATIONS_FOR_APPROVAL)
+            await conn.execute("RESET enable_seqscan")
+        return "\n".join(row[0] for row in rows)
+
+    assert "ix_msgs_user_farmer_ts" in run_with_db(database_url, scenario)
+
+
+def test_conversation_details_bulk_matches_single_lookups(database_url):
+    async def scenario(db):
+        # An empty id list is answered without touching the database
+        empty = await db.get_conversation_details_bulk([])
+        pool_after_empty = db.pool
+        ids = [
+            await db.save_conversation(1, {"question": "Kada sijati kukuruz?", "answer": "U travnju."}),
+            await db.save_conversation(1, {"question": "Koliko gnojiva?", "answer": "Ovisi o tlu."}),
+        ]
+        bulk = await db.get_conversation_details_bulk(ids + [999999])
+        single = {conversation_id: await db.get_conversation_details(conversation_id) for conversation_id in ids}
+        return empty, pool_after_empty, bulk, single
+
+    empty, pool_after_empty, bulk, single = run_with_db(database_url, scenario)
+    assert empty == {}
+    assert pool_after_empty is None
+    assert bulk == single
+    assert all(details is not None for details in single.values())
\ No newline at end of file